@@ -86,10 +86,70 @@ The following columns are irrelevant for analysis and can be dropped:
 - **Postal_Code**: Not critical for regional analysis, as we already have **City** and **State** columns.
 - **Country**: Contains only **1 unique value** (United States), making it redundant for analysis.
 - **Product_ID**: While useful for unique identification, it is not necessary for aggregate analysis.
+"""
+
+"""# Data Modelling (Star Schema)
 
-# Data Cleaning
+The raw export repeats the customer, location and product attributes on every line item. Before cleaning, the flat file is split into a narrow **fact_sales** table and three deduplicated dimension tables (**dim_customer**, **dim_product**, **dim_location**) keyed by integer surrogate keys. The fact table only keeps the order, dates, ship mode, sales and the three integer keys, so joins and groupbys run on integers instead of repeated strings.
 """
 
+# Customer dimension: one row per customer with an integer surrogate key
+dim_customer = df[['Customer_ID', 'Customer_Name', 'Segment']].drop_duplicates('Customer_ID')
+dim_customer = dim_customer.sort_values('Customer_ID').reset_index(drop=True)
+dim_customer.insert(0, 'Customer_Key', np.arange(1, len(dim_customer) + 1, dtype='int32'))
+dim_customer['Segment'] = dim_customer['Segment'].astype('category')
+dim_customer.head()
+
+# Product dimension
+# Some Product_ID values are reused for completely different products (and some Product_Name values
+# appear under several IDs), so neither column alone identifies a product.
+# Each distinct (Product_ID, Product_Name) pair gets its own surrogate key, and the conflicts are flagged.
+dim_product = df[['Product_ID', 'Product_Name', 'Category', 'Sub_Category']].drop_duplicates(['Product_ID', 'Product_Name'])
+dim_product = dim_product.sort_values(['Product_ID', 'Product_Name']).reset_index(drop=True)
+dim_product.insert(0, 'Product_Key', np.arange(1, len(dim_product) + 1, dtype='int32'))
+dim_product['Shared_ID'] = dim_product['Product_ID'].duplicated(keep=False)
+dim_product['Shared_Name'] = dim_product['Product_Name'].duplicated(keep=False)
+dim_product[['Category', 'Sub_Category']] = dim_product[['Category', 'Sub_Category']].astype('category')
+
+print(f"Product IDs used for more than one product name: {dim_product.loc[dim_product['Shared_ID'], 'Product_ID'].nunique()}")
+print(f"Product names listed under more than one product ID: {dim_product.loc[dim_product['Shared_Name'], 'Product_Name'].nunique()}")
+
+# Location dimension: one row per distinct City / State / Postal_Code / Region combination
+location_columns = ['City', 'State', 'Postal_Code', 'Region']
+dim_location = df[location_columns].drop_duplicates()
+dim_location = dim_location.sort_values(location_columns).reset_index(drop=True)
+dim_location.insert(0, 'Location_Key', np.arange(1, len(dim_location) + 1, dtype='int32'))
+dim_location['Region'] = dim_location['Region'].astype('category')
+dim_location.head()
+
+# Fact table: one row per line item, referencing the dimensions through integer keys
+fact_sales = (
+    df[['Order_ID', 'Order_Date', 'Ship_Date', 'Ship_Mode', 'Customer_ID', 'Product_ID', 'Product_Name', 'Sales'] + location_columns]
+    .merge(dim_customer[['Customer_Key', 'Customer_ID']], on='Customer_ID', how='left')
+    .merge(dim_product[['Product_Key', 'Product_ID', 'Product_Name']], on=['Product_ID', 'Product_Name'], how='left')
+    .merge(dim_location[['Location_Key'] + location_columns], on=location_columns, how='left')
+)
+fact_sales = fact_sales[['Order_ID', 'Order_Date', 'Ship_Date', 'Customer_Key', 'Product_Key', 'Location_Key', 'Ship_Mode', 'Sales']]
+fact_sales['Order_Date'] = pd.to_datetime(fact_sales['Order_Date'], format='%d/%m/%Y')
+fact_sales['Ship_Date'] = pd.to_datetime(fact_sales['Ship_Date'], format='%d/%m/%Y')
+fact_sales['Ship_Mode'] = fact_sales['Ship_Mode'].astype('category')
+
+# Every line item must resolve to exactly one key in each dimension
+assert len(fact_sales) == len(df)
+assert fact_sales[['Customer_Key', 'Product_Key', 'Location_Key']].notna().all().all()
+fact_sales.head()
+
+# Compare the size of the flat export with the star schema
+flat_size = df.memory_usage(deep=True).sum()
+star_size = sum(table.memory_usage(deep=True).sum() for table in [fact_sales, dim_customer, dim_product, dim_location])
+fact_size = fact_sales.memory_usage(deep=True).sum()
+
+print(f'Flat export: {flat_size / 1024**2:.2f} MB')
+print(f'Star schema: {star_size / 1024**2:.2f} MB (fact table: {fact_size / 1024**2:.2f} MB)')
+print(f'Reduction: {(1 - star_size / flat_size) * 100:.2f}%')
+
+"""# Data Cleaning"""
+
 # Dropping columns that are irrelevant for analysis
 df.drop(['Country', 'Row_ID', 'Customer_Name', 'Postal_Code', 'Product_ID'], axis=1, inplace=True)
 
@@ -212,10 +272,154 @@ Actionable Strategies :
   - Home Office Customers: Improve engagement with targeted campaigns to reduce the time between orders.
 
 * Capitalize on Seasonal Trends: Plan promotions and campaigns around the second half of the year when repeat orders spike.
+"""
+
+"""##### Per-Customer Sequential Metrics
 
-##### Average Order Value (AOV)
+The retention metrics above (consecutive order gaps, repeat orders per month, first and last purchase) are sequential per customer, and pandas computes them through several sorts and groupby passes. The cells below compute all of them together by sorting the line items once and walking the customer-sorted arrays in a single pass. The loop is compiled with **Numba** when it is installed, and the pure pandas implementation is used otherwise.
 """
 
+# Optional accelerator: the kernel is compiled with Numba when it is available
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Single pass over line items sorted by customer, order date and order ID.
+# Order dates are integer days, customers / orders / months are integer codes.
+def customer_sequence_kernel(customer, day, order, month, n_customers, n_months):
+    n = len(customer)
+    first_purchase = np.zeros(n_customers, dtype=np.int64)
+    last_purchase = np.zeros(n_customers, dtype=np.int64)
+    order_dates = np.zeros(n_customers, dtype=np.int64)
+    orders = np.zeros(n_customers, dtype=np.int64)
+    line_items = np.zeros(n_customers, dtype=np.int64)
+    date_diff_sum = np.zeros(n_customers, dtype=np.int64)
+    date_diff = np.empty(n, dtype=np.float64)
+    repeat_orders = np.zeros(n_months, dtype=np.int64)
+
+    month_orders = 0
+    for i in range(n):
+        c = customer[i]
+        if i == 0 or c != customer[i - 1]:
+            # First line item of a new customer
+            first_purchase[c] = day[i]
+            order_dates[c] = 1
+            orders[c] = 1
+            date_diff[i] = np.nan
+            month_orders = 1
+        else:
+            gap = day[i] - day[i - 1]
+            date_diff[i] = gap
+            date_diff_sum[c] += gap
+            if gap != 0:
+                order_dates[c] += 1
+            if order[i] != order[i - 1]:
+                orders[c] += 1
+                if month[i] != month[i - 1]:
+                    if month_orders > 1:
+                        repeat_orders[month[i - 1]] += 1
+                    month_orders = 1
+                else:
+                    month_orders += 1
+        last_purchase[c] = day[i]
+        line_items[c] += 1
+
+        # Close the last month of the current customer
+        if (i == n - 1 or customer[i + 1] != c) and month_orders > 1:
+            repeat_orders[month[i]] += 1
+
+    return first_purchase, last_purchase, order_dates, orders, line_items, date_diff_sum, date_diff, repeat_orders
+
+
+customer_sequence_kernel_numba = njit(customer_sequence_kernel) if njit is not None else None
+
+
+# Per-customer statistics, per line item order gap and repeat orders per month
+# backend: 'auto' (Numba when available, otherwise pandas), 'numba', 'python' (uncompiled kernel) or 'pandas'
+def customer_sequence_stats(data, backend='auto'):
+    if backend == 'auto':
+        backend = 'numba' if customer_sequence_kernel_numba is not None else 'pandas'
+    if backend == 'numba' and customer_sequence_kernel_numba is None:
+        raise ImportError("The 'numba' backend requires Numba to be installed")
+
+    ordered = data[['customer_id', 'order_date', 'order_id', 'month_year_od']].sort_values(['customer_id', 'order_date', 'order_id'])
+
+    if backend == 'pandas':
+        date_diff = ordered.groupby('customer_id')['order_date'].diff().dt.days
+        customer_stats = ordered.assign(date_diff=date_diff).groupby('customer_id').agg(
+            first_purchase=('order_date', 'min'),
+            last_purchase=('order_date', 'max'),
+            order_dates=('order_date', 'nunique'),
+            orders=('order_id', 'nunique'),
+            line_items=('order_id', 'size'),
+            date_diff_sum=('date_diff', 'sum')
+        )
+        customer_stats['date_diff_sum'] = customer_stats['date_diff_sum'].astype('int64')
+
+        monthly_orders = ordered.groupby(['customer_id', 'month_year_od'])['order_id'].nunique().reset_index()
+        repeat_orders_over_time = monthly_orders[monthly_orders['order_id'] > 1].groupby('month_year_od').size()
+        return customer_stats, date_diff.reindex(data.index), repeat_orders_over_time
+
+    if backend not in ('numba', 'python'):
+        raise ValueError(f"Unknown backend: {backend!r}")
+    kernel = customer_sequence_kernel_numba if backend == 'numba' else customer_sequence_kernel
+
+    customer_codes, customers = pd.factorize(ordered['customer_id'], sort=True)
+    order_codes, _ = pd.factorize(ordered['order_id'])
+    month_codes, months = pd.factorize(ordered['month_year_od'], sort=True)
+    days = ordered['order_date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+
+    (first_purchase, last_purchase, order_dates, orders, line_items,
+     date_diff_sum, date_diff, repeat_orders) = kernel(
+        customer_codes, days, order_codes, month_codes, len(customers), len(months)
+    )
+
+    date_dtype = ordered['order_date'].dtype
+    customer_stats = pd.DataFrame({
+        'first_purchase': first_purchase.astype('datetime64[D]').astype(date_dtype),
+        'last_purchase': last_purchase.astype('datetime64[D]').astype(date_dtype),
+        'order_dates': order_dates,
+        'orders': orders,
+        'line_items': line_items,
+        'date_diff_sum': date_diff_sum
+    }, index=pd.Index(customers, name='customer_id'))
+
+    repeat_orders_over_time = pd.Series(repeat_orders, index=pd.Index(months, name='month_year_od'))
+    repeat_orders_over_time = repeat_orders_over_time[repeat_orders_over_time > 0]
+    return customer_stats, pd.Series(date_diff, index=ordered.index).reindex(data.index), repeat_orders_over_time
+
+# Check that the kernel reproduces the pandas results exactly
+kernel_backend = 'numba' if customer_sequence_kernel_numba is not None else 'python'
+kernel_stats, kernel_date_diff, kernel_repeat_orders = customer_sequence_stats(df, backend=kernel_backend)
+pandas_stats, pandas_date_diff, pandas_repeat_orders = customer_sequence_stats(df, backend='pandas')
+
+pd.testing.assert_frame_equal(kernel_stats, pandas_stats, check_index_type=False)
+pd.testing.assert_series_equal(kernel_date_diff, pandas_date_diff, check_names=False)
+pd.testing.assert_series_equal(kernel_repeat_orders, pandas_repeat_orders, check_index_type=False)
+
+# ... and the metrics computed earlier in this section
+assert (kernel_stats['order_dates'] > 1).sum() == repeat_customers
+assert kernel_repeat_orders.equals(repeat_orders_over_time)
+assert kernel_date_diff.mean() == customer_order_date['date_diff'].mean()
+customer_gaps = kernel_stats[['date_diff_sum']].assign(
+    gaps=kernel_stats['line_items'] - 1,
+    segment=df.groupby('customer_id')['segment'].first()
+)
+segment_gaps = customer_gaps.groupby('segment')[['date_diff_sum', 'gaps']].sum()
+assert ((segment_gaps['date_diff_sum'] / segment_gaps['gaps']).to_numpy() == segment_time_diff['avg_time_between_orders'].to_numpy()).all()
+assert kernel_stats['first_purchase'].equals(first_purchase.set_index('customer_id')['order_date'])
+print(f'The {kernel_backend} kernel matches the pandas implementation')
+
+# Per-customer summary from a single pass
+customer_stats, _, _ = customer_sequence_stats(df)
+customer_stats['avg_time_between_orders'] = customer_stats['date_diff_sum'] / (customer_stats['line_items'] - 1)
+print(f"The average time between repeat orders for customers is {customer_stats['date_diff_sum'].sum() / (customer_stats['line_items'] - 1).sum():.2f} days")
+customer_stats.head()
+
+"""##### Average Order Value (AOV)"""
+
 # Calculate Average Order Value per Year
 total_sales_orders = df.groupby('year_od').agg(
     total_sales=('sales', 'sum'),